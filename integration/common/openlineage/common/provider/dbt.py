@@ -6,9 +6,11 @@ import datetime
 import json
 import logging
 import os
+import sys
 import uuid
 from enum import Enum
-from typing import Dict, List, Optional, Tuple, TypeVar, Any
+from typing import (IO, Any, Callable, Collection, Dict, List, NamedTuple, Optional, Tuple,
+                    TypeVar)
 
 import attr
 import yaml
@@ -26,6 +28,28 @@ from openlineage.common.schema import GITHUB_LOCATION
 from openlineage.common.utils import (get_from_multiple_chains,
                                       get_from_nullable_chain)
 
+try:
+    import orjson
+
+    def _loads(data: bytes) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson rejects NaN and Infinity, which Python's json module writes and accepts
+            return json.loads(data)
+except ImportError:
+    _loads = json.loads  # type: ignore
+
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader  # type: ignore
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 
 class Adapter(Enum):
     # This class represents supported adapters.
@@ -68,13 +92,13 @@ class SkipUndefined(Undefined):
         return f"{{{{ {self._undefined_name}({arguments}) }}}}"
 
 
-@attr.s
-class ModelNode:
-    metadata_node: Dict = attr.ib()
-    catalog_node: Optional[Dict] = attr.ib(default=None)
+class ModelNode(NamedTuple):
+    # Created for every input edge, so kept as light as possible
+    metadata_node: Dict
+    catalog_node: Optional[Dict] = None
 
 
-@attr.s
+@attr.s(slots=True)
 class DbtRun:
     started_at: str = attr.ib()
     completed_at: str = attr.ib()
@@ -86,14 +110,14 @@ class DbtRun:
     run_id: str = attr.ib(factory=lambda: str(uuid.uuid4()))
 
 
-@attr.s
+@attr.s(slots=True)
 class DbtRunResult:
     start: RunEvent = attr.ib()
     complete: Optional[RunEvent] = attr.ib(default=None)
     fail: Optional[RunEvent] = attr.ib(default=None)
 
 
-@attr.s
+@attr.s(slots=True)
 class DbtEvents:
     starts: List[RunEvent] = attr.ib(factory=list)
     completes: List[RunEvent] = attr.ib(factory=list)
@@ -152,10 +176,39 @@ class DbtVersionRunFacet(BaseFacet):
 
 T = TypeVar('T')
 
+UTC = datetime.timezone.utc
+
+# dbt artifact schema versions supported by dbt-ol
+MANIFEST_SCHEMA_VERSIONS = frozenset({2, 3, 4, 5, 6, 7})
+RUN_RESULTS_SCHEMA_VERSIONS = frozenset({2, 3, 4, 5})
+CATALOG_SCHEMA_VERSIONS = frozenset({1})
+
+if sys.version_info >= (3, 9):
+    _removeprefix = str.removeprefix
+else:
+    def _removeprefix(string: str, prefix: str) -> str:
+        return string[len(prefix):] if string.startswith(prefix) else string
+
+# Catalog stats paths for table size and row count, per adapter
+BYTES_STATS_CHAINS = (
+    ('stats', 'num_bytes', 'value'),  # bigquery
+    ('stats', 'bytes', 'value'),  # snowflake
+    ('stats', 'size', 'value')  # redshift (Note: size = count of 1MB blocks)
+)
+ROWS_STATS_CHAINS = (
+    ('stats', 'num_rows', 'value'),  # bigquery
+    ('stats', 'row_count', 'value'),  # snowflake
+    ('stats', 'rows', 'value')  # redshift
+)
+
 logging.getLogger('null').addHandler(logging.NullHandler())
 
 
 class DbtArtifactProcessor:
+    # Parsed artifacts and yaml files, keyed by path: ((mtime, size), variant, content).
+    # At most one copy of each file is kept - see clear_cache() to release them.
+    _cache: Dict[str, Tuple[Tuple[int, int], Any, Any]] = {}
+
     def __init__(
         self,
         producer: str,
@@ -176,6 +229,7 @@ class DbtArtifactProcessor:
 
         self.job_namespace = job_namespace
         self.dataset_namespace = ""
+        self.dataset_source_facet: Optional[DataSourceDatasetFacet] = None
         self.skip_errors = skip_errors
         self.project = self.load_yaml_with_jinja(os.path.join(project_dir, 'dbt_project.yml'))
         self.run_metadata = None
@@ -199,20 +253,19 @@ class DbtArtifactProcessor:
         """
             Parse dbt manifest and run_result and produce OpenLineage events.
         """
-        manifest = self.load_metadata(self.manifest_path, [2, 3, 4, 5, 6, 7], self.logger)
+        manifest = self.load_metadata(
+            self.manifest_path, MANIFEST_SCHEMA_VERSIONS, self.logger,
+            keys=['metadata', 'nodes', 'sources', 'parent_map']
+        )
         self.manifest_version = self.get_schema_version(manifest)
 
-        run_result = self.load_metadata(self.run_result_path, [2, 3, 4, 5], self.logger)
+        run_result = self.load_metadata(
+            self.run_result_path, RUN_RESULTS_SCHEMA_VERSIONS, self.logger,
+            keys=['metadata', 'args', 'results']
+        )
         self.run_metadata = run_result['metadata']
         self.command = run_result['args']['which']
 
-        try:
-            catalog: Optional[Dict[Any, Any]] = self.load_metadata(
-                self.catalog_path, [1], self.logger
-            )
-        except FileNotFoundError:
-            catalog = None
-
         profile_dir = run_result['args']['profiles_dir']
 
         if not self.profile_name:
@@ -233,13 +286,14 @@ class DbtArtifactProcessor:
         self.extract_adapter_type(profile)
         self.extract_dataset_namespace(profile)
 
-        nodes = {}
         # Filter non-model or test nodes
-        for name, node in manifest['nodes'].items():
-            if name.startswith('model.') or name.startswith('test.'):
-                nodes[name] = node
+        nodes = {
+            name: node for name, node in manifest['nodes'].items()
+            if name.startswith(('model.', 'test.'))
+        }
 
-        context = DbtRunContext(manifest, run_result, catalog)
+        # Catalog is loaded by parse_execution, only if there are model runs to describe
+        context = DbtRunContext(manifest, run_result)
 
         if self.command not in ['run', 'build', 'test']:
             raise ValueError(
@@ -258,28 +312,105 @@ class DbtArtifactProcessor:
     def load_metadata(
         cls,
         path: str,
-        desired_schema_versions: List[int],
-        logger: logging.Logger
+        desired_schema_versions: Collection[int],
+        logger: logging.Logger,
+        keys: Optional[List[str]] = None
     ) -> Dict:
-        with open(path, 'r') as f:
-            metadata = json.load(f)
-            str_schema_version = get_from_nullable_chain(
-                metadata,
-                ['metadata', 'dbt_schema_version']
-            )
-            schema_version = cls.get_schema_version(metadata)
-            if schema_version not in desired_schema_versions:
-                if schema_version > max(desired_schema_versions):
-                    logger.warning(
-                        f"Artifact schema version: {str_schema_version} is above dbt-ol "
-                        f"supported version {max(desired_schema_versions)}. "
-                        f"This might cause errors."
-                    )
-                else:
-                    raise ValueError(f"Wrong version of dbt metadata: {schema_version}, "
-                                     f"should be in {desired_schema_versions}")
+        """
+        Load dbt artifact and verify its schema version.
+        If keys are passed, only those top-level keys are kept - when ijson is
+        available, the artifact is streamed in a single pass and other top-level
+        values are skipped by the parser without being built.
+        """
+        metadata = cls._load_cached(
+            path, tuple(keys) if keys is not None else None,
+            lambda: cls._read_metadata(path, keys)
+        )
+        str_schema_version = get_from_nullable_chain(
+            metadata,
+            ['metadata', 'dbt_schema_version']
+        )
+        schema_version = cls.get_schema_version(metadata)
+        if schema_version not in desired_schema_versions:
+            if schema_version > max(desired_schema_versions):
+                logger.warning(
+                    f"Artifact schema version: {str_schema_version} is above dbt-ol "
+                    f"supported version {max(desired_schema_versions)}. "
+                    f"This might cause errors."
+                )
+            else:
+                raise ValueError(f"Wrong version of dbt metadata: {schema_version}, "
+                                 f"should be in {sorted(desired_schema_versions)}")
+        return metadata
+
+    @staticmethod
+    def _read_metadata(path: str, keys: Optional[List[str]]) -> Dict:
+        with open(path, 'rb') as f:
+            if keys is not None and ijson:
+                try:
+                    return DbtArtifactProcessor._stream_keys(f, keys)
+                except ijson.JSONError:
+                    # ijson rejects NaN and Infinity, which Python's json module writes
+                    f.seek(0)
+            metadata = _loads(f.read())
+            if keys is not None:
+                metadata = {key: metadata[key] for key in keys if key in metadata}
             return metadata
 
+    @staticmethod
+    def _stream_keys(f: IO[bytes], keys: List[str]) -> Dict:
+        wanted = set(keys)
+        metadata = {}
+        events = ijson.parse(f, use_float=True)
+        for prefix, event, value in events:
+            if prefix not in wanted or event == 'map_key':
+                continue
+            if event in ('start_map', 'start_array'):
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+                # Nested events have longer prefixes, so value ends at its own prefix
+                for nested_prefix, event, value in events:
+                    builder.event(event, value)
+                    if nested_prefix == prefix and event in ('end_map', 'end_array'):
+                        break
+                metadata[prefix] = builder.value
+            else:
+                metadata[prefix] = value
+            if len(metadata) == len(wanted):
+                break
+        return metadata
+
+    @classmethod
+    def _load_cached(cls, path: str, variant: Any, load: Callable[[], T]) -> T:
+        """
+        Memoize parsed file content until clear_cache() is called, invalidated
+        when file's mtime or size changes or it's loaded as a different variant (e.g. with
+        other top-level keys), which then replaces the cached copy.
+        Set OPENLINEAGE_DBT_CACHE=false to disable.
+        """
+        if os.getenv("OPENLINEAGE_DBT_CACHE", None) in [False, 'false', 'False', '0']:
+            return load()
+        # Size catches rewrites within the same tick on filesystems with coarse timestamps
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = cls._cache.get(path)
+        if cached and cached[0] == version and cached[1] == variant:
+            return cached[2]
+        value = load()
+        cls._cache[path] = (version, variant, value)
+        return value
+
+    @classmethod
+    def clear_cache(cls):
+        """Release parsed artifacts and yaml files kept between parse() calls."""
+        cls._cache.clear()
+
+    def load_catalog(self) -> Optional[Dict]:
+        try:
+            return self.load_metadata(self.catalog_path, CATALOG_SCHEMA_VERSIONS, self.logger)
+        except FileNotFoundError:
+            return None
+
     @classmethod
     def get_schema_version(cls, metadata):
         str_schema_version = get_from_nullable_chain(
@@ -310,10 +441,12 @@ class DbtArtifactProcessor:
             msg = f"Env var required but not provided: '{var}'"
             raise Exception(msg)
 
-    @staticmethod
-    def load_yaml(path: str) -> Dict:
-        with open(path, 'r') as f:
-            return yaml.load(f, Loader=yaml.FullLoader)
+    @classmethod
+    def load_yaml(cls, path: str) -> Dict:
+        def load():
+            with open(path, 'r') as f:
+                return yaml.load(f, Loader=YamlLoader)
+        return cls._load_cached(path, 'yaml', load)
 
     @staticmethod
     def setup_jinja() -> Environment:
@@ -359,37 +492,39 @@ class DbtArtifactProcessor:
         context: DbtRunContext,
         nodes: Dict
     ) -> DbtEvents:
-        events = DbtEvents()
-        for run in context.run_results['results']:
-            name = run['unique_id']
-            if not name.startswith('model.') and not name.startswith('source.'):
-                continue
-            if run['status'] == 'skipped':
-                continue
+        results = [
+            run for run in context.run_results['results']
+            if run['unique_id'].startswith(('model.', 'source.')) and run['status'] != 'skipped'
+        ]
+        if not results:
+            return DbtEvents()
+        if context.catalog is None:
+            context = attr.evolve(context, catalog=self.load_catalog())
+
+        catalog_nodes = (context.catalog or {}).get('nodes') or {}
+        catalog_sources = (context.catalog or {}).get('sources') or {}
+        sources = context.manifest.get('sources', {})
+        job_suffix = ".build.run" if self.command == 'build' else ""
 
-            output_node = nodes[name]
+        events = DbtEvents()
+        for run in results:
+            output_node = nodes[run['unique_id']]
             started_at, completed_at = self.get_timings(run['timing'])
-            namespace, name, _ = self.extract_dataset_data(
-                ModelNode(output_node), None, has_facets=False
-            )
 
             inputs = []
             for node in context.manifest['parent_map'][run['unique_id']]:
-                if node.startswith('model.'):
-                    inputs.append(ModelNode(
-                        nodes[node],
-                        get_from_nullable_chain(context.catalog, ['nodes', node])
+                if node in nodes:
+                    inputs.append(self.node_to_dataset(
+                        ModelNode(nodes[node], catalog_nodes.get(node)), has_facets=True
                     ))
-                elif node.startswith('source.'):
-                    inputs.append(ModelNode(
-                        context.manifest['sources'][node],
-                        get_from_nullable_chain(context.catalog, ['sources', node])
+                elif node in sources:
+                    inputs.append(self.node_to_dataset(
+                        ModelNode(sources[node], catalog_sources.get(node)), has_facets=True
                     ))
 
             run_id = str(uuid.uuid4())
-            job_name = f"{output_node['database']}.{output_node['schema']}" \
-                f".{self.removeprefix(run['unique_id'], 'model.')}" \
-                + (".build.run" if self.command == 'build' else "")
+            job_name = f"{output_node['database']}.{output_node['schema']}." \
+                f"{_removeprefix(run['unique_id'], 'model.')}{job_suffix}"
 
             if self.manifest_version >= 7:
                 sql = output_node['compiled_code']
@@ -408,12 +543,9 @@ class DbtArtifactProcessor:
                         'sql': SqlJobFacet(sql)
                     }
                 ),
-                [self.node_to_dataset(node, has_facets=True) for node in inputs],
+                inputs,
                 self.node_to_output_dataset(
-                    ModelNode(
-                        output_node,
-                        get_from_nullable_chain(context.catalog, ['nodes', run['unique_id']])
-                    ),
+                    ModelNode(output_node, catalog_nodes.get(run['unique_id'])),
                     has_facets=True
                 )
             ))
@@ -426,16 +558,14 @@ class DbtArtifactProcessor:
     ) -> DbtEvents:
 
         # The tests can have different timings, so just take current time
-        started_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
-        completed_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        started_at = completed_at = datetime.datetime.now(UTC).isoformat()
 
         assertions = self.parse_assertions(context, nodes)
+        job_suffix = ".build.test" if self.command == 'build' else ""
 
         events = DbtEvents()
         for name, node in context.manifest['nodes'].items():
-            if not name.startswith('model.') and not name.startswith('source.'):
-                continue
-            if len(assertions[name]) == 0:
+            if name not in assertions or not name.startswith(('model.', 'source.')):
                 continue
 
             assertion_facet = DataQualityAssertionsDatasetFacet(
@@ -449,8 +579,7 @@ class DbtArtifactProcessor:
             )
 
             job_name = f"{node['database']}.{node['schema']}." \
-                f"{self.removeprefix(node['unique_id'], 'model.')}" \
-                + (".build.test" if self.command == 'build' else "")
+                f"{_removeprefix(node['unique_id'], 'model.')}{job_suffix}"
 
             run_id = str(uuid.uuid4())
             events.add(self.to_openlineage_events(
@@ -471,6 +600,7 @@ class DbtArtifactProcessor:
         context: DbtRunContext,
         nodes: Dict
     ) -> Dict[str, List[Assertion]]:
+        sources = context.manifest.get('sources', {})
         assertions = collections.defaultdict(list)
         for run in context.run_results['results']:
             if not run['unique_id'].startswith('test.'):
@@ -479,7 +609,7 @@ class DbtArtifactProcessor:
 
             model_node = None
             for node in context.manifest['parent_map'][run['unique_id']]:
-                if node.startswith('model.') or node.startswith('source.'):
+                if node in nodes or node in sources:
                     model_node = node
 
             assertions[model_node].append(Assertion(
@@ -515,6 +645,14 @@ class DbtArtifactProcessor:
         inputs: List[Dataset],
         output: Optional[Dataset]
     ) -> Optional[DbtRunResult]:
+        if status not in ('success', 'error'):
+            # Should not happen?
+            raise ValueError(f"Run status was {status}, "
+                             f"should be in ['success', 'skipped', 'error']")
+
+        # START and COMPLETE events describe the same run, job and datasets,
+        # so they share those objects instead of rebuilding them per event
+        outputs = [output] if output else []
         start = RunEvent(
             eventType=RunState.START,
             eventTime=started_at,
@@ -522,7 +660,7 @@ class DbtArtifactProcessor:
             job=job,
             producer=self.producer,
             inputs=inputs,
-            outputs=[output] if output else []
+            outputs=outputs
         )
         if status == 'success':
             return DbtRunResult(
@@ -534,26 +672,21 @@ class DbtArtifactProcessor:
                     job=job,
                     producer=self.producer,
                     inputs=inputs,
-                    outputs=[output] if output else []
+                    outputs=outputs
                 )
             )
-        elif status == 'error':
-            return DbtRunResult(
-                start,
-                fail=RunEvent(
-                    eventType=RunState.FAIL,
-                    eventTime=completed_at,
-                    run=run,
-                    job=job,
-                    producer=self.producer,
-                    inputs=inputs,
-                    outputs=[]
-                )
+        return DbtRunResult(
+            start,
+            fail=RunEvent(
+                eventType=RunState.FAIL,
+                eventTime=completed_at,
+                run=run,
+                job=job,
+                producer=self.producer,
+                inputs=inputs,
+                outputs=[]
             )
-        else:
-            # Should not happen?
-            raise ValueError(f"Run status was {status}, "
-                             f"should be in ['success', 'skipped', 'error']")
+        )
 
     def node_to_dataset(
         self,
@@ -572,22 +705,8 @@ class DbtArtifactProcessor:
         name, namespace, facets = self.extract_dataset_data(node, None, has_facets)
         output_facets = {}
         if has_facets and node.catalog_node:
-            bytes = get_from_multiple_chains(
-                node.catalog_node,
-                [
-                    ['stats', 'num_bytes', 'value'],  # bigquery
-                    ['stats', 'bytes', 'value'],  # snowflake
-                    ['stats', 'size', 'value']  # redshift (Note: size = count of 1MB blocks)
-                ]
-            )
-            rows = get_from_multiple_chains(
-                node.catalog_node,
-                [
-                    ['stats', 'num_rows', 'value'],  # bigquery
-                    ['stats', 'row_count', 'value'],  # snowflake
-                    ['stats', 'rows', 'value']  # redshift
-                ]
-            )
+            bytes = get_from_multiple_chains(node.catalog_node, BYTES_STATS_CHAINS)
+            rows = get_from_multiple_chains(node.catalog_node, ROWS_STATS_CHAINS)
 
             if bytes:
                 bytes = int(bytes) if self.adapter_type != Adapter.REDSHIFT \
@@ -610,24 +729,20 @@ class DbtArtifactProcessor:
         has_facets: bool = False
     ) -> Tuple[str, str, Dict]:
         if has_facets:
-            facets = {
-                'dataSource': DataSourceDatasetFacet(
-                    name=self.dataset_namespace,
-                    uri=self.dataset_namespace
-                ),
-                'schema': SchemaDatasetFacet(
-                    fields=self.extract_metadata_fields(node.metadata_node['columns'].values())
+            # Catalog has more complete column info, fall back to metadata only without it
+            if node.catalog_node:
+                fields = self.extract_catalog_fields(
+                    node.catalog_node['columns'].values(),
+                    node.metadata_node['columns']
                 )
+            else:
+                fields = self.extract_metadata_fields(node.metadata_node['columns'].values())
+            facets = {
+                'dataSource': self.dataset_source_facet,
+                'schema': SchemaDatasetFacet(fields=fields)
             }
             if assertions:
                 facets['dataQualityAssertions'] = assertions
-            if node.catalog_node:
-                facets['schema'] = SchemaDatasetFacet(
-                    fields=self.extract_catalog_fields(
-                        node.catalog_node['columns'].values(),
-                        node.metadata_node['columns']
-                    )
-                )
         else:
             facets = {}
         return (
@@ -645,32 +760,26 @@ class DbtArtifactProcessor:
         Should be used only in the lack of catalog's presence, as there's less
         information in metadata file than in catalog.
         """
-        fields = []
-        for field in columns:
-            type, description = None, None
-            if 'data_type' in field and field['data_type'] is not None:
-                type = field['data_type']
-            if 'description' in field and field['description'] is not None:
-                description = field['description']
-            fields.append(SchemaField(
-                name=field['name'], type=type, description=description
-            ))
-        return fields
+        return [
+            SchemaField(
+                name=field['name'],
+                type=field.get('data_type'),
+                description=field.get('description')
+            )
+            for field in columns
+        ]
 
     @staticmethod
     def extract_catalog_fields(columns: List[Dict], metadata_columns: Dict) -> List[SchemaField]:
         """Extract table field info from catalog's node column info"""
-        fields = []
-        for field in columns:
-            name = field['name']
-            type = None
-            if 'type' in field and field['type'] is not None:
-                type = field['type']
-            description = get_from_nullable_chain(metadata_columns, [name, 'description'])
-            fields.append(SchemaField(
-                name=name, type=type, description=description
-            ))
-        return fields
+        return [
+            SchemaField(
+                name=field['name'],
+                type=field.get('type'),
+                description=metadata_columns.get(field['name'], {}).get('description')
+            )
+            for field in columns
+        ]
 
     def extract_adapter_type(self, profile: Dict):
         try:
@@ -683,6 +792,11 @@ class DbtArtifactProcessor:
 
     def extract_dataset_namespace(self, profile: Dict):
         self.dataset_namespace = self.extract_namespace(profile)
+        # Every dataset shares the same data source, so a single facet instance is reused
+        self.dataset_source_facet = DataSourceDatasetFacet(
+            name=self.dataset_namespace,
+            uri=self.dataset_namespace
+        )
 
     def extract_namespace(self, profile: Dict) -> str:
         """Extract namespace from profile's type"""
@@ -738,16 +852,9 @@ class DbtArtifactProcessor:
     def get_timings(timings: List[Dict]) -> Tuple[str, str]:
         """Extract timing info from run_result's timing dict"""
         try:
-            timing = list(filter(lambda x: x['name'] == 'execute', timings))[0]
+            timing = next(t for t in timings if t['name'] == 'execute')
             return timing['started_at'], timing['completed_at']
-        except IndexError:
+        except StopIteration:
             # Run failed: there is no timing data
-            timing_str = datetime.datetime.now(datetime.timezone.utc).isoformat()
+            timing_str = datetime.datetime.now(UTC).isoformat()
             return timing_str, timing_str
-
-    @staticmethod
-    def removeprefix(string: str, prefix: str) -> str:
-        if string.startswith(prefix):
-            return string[len(prefix):]
-        else:
-            return string[:]
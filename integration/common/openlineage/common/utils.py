@@ -1,10 +1,10 @@
 # Copyright 2018-2023 contributors to the OpenLineage project
 # SPDX-License-Identifier: Apache-2.0
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Sequence
 
 
-def get_from_nullable_chain(source: Any, chain: List[str]) -> Optional[Any]:
+def get_from_nullable_chain(source: Any, chain: Sequence[str]) -> Optional[Any]:
     """
     Get object from nested structure of objects, where it's not guaranteed that
     all keys in the nested structure exist.
@@ -22,10 +22,8 @@ def get_from_nullable_chain(source: Any, chain: List[str]) -> Optional[Any]:
     if not result:
         return None
     """
-    chain.reverse()
     try:
-        while chain:
-            next_key = chain.pop()
+        for next_key in chain:
             if isinstance(source, dict):
                 source = source.get(next_key)
             else:
@@ -35,7 +33,9 @@ def get_from_nullable_chain(source: Any, chain: List[str]) -> Optional[Any]:
         return None
 
 
-def get_from_multiple_chains(source: Dict[str, Any], chains: List[List[str]]) -> Optional[Any]:
+def get_from_multiple_chains(
+    source: Dict[str, Any], chains: Sequence[Sequence[str]]
+) -> Optional[Any]:
     for chain in chains:
         result = get_from_nullable_chain(source, chain)
         if result:
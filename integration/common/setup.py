@@ -33,6 +33,8 @@ extras_require = {
     ],
     "dbt": [
         "dbt-core>=0.20.0",
+        "ijson>=3.1.0",
+        "orjson>=3.6.0",
         "pyyaml>=5.3.1"
     ],
     "great_expectations": [
@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import json
+import math
 import textwrap
 from enum import Enum
 from unittest import mock
@@ -223,6 +224,90 @@ def test_logging_handler_does_not_warn():
     logger.warning.assert_not_called()
 
 
+@pytest.mark.parametrize("keys", [None, ['metadata', 'nodes']])
+def test_load_metadata_accepts_nan(tmp_path, keys):
+    path = tmp_path / 'manifest.json'
+    path.write_text(
+        '{"metadata": {"dbt_schema_version": '
+        '"https://schemas.getdbt.com/dbt/manifest/v7.json"}, '
+        '"nodes": {"model.a": {"stats": NaN}}}'
+    )
+    manifest = DbtArtifactProcessor.load_metadata(str(path), [7], mock.Mock(), keys=keys)
+
+    assert math.isnan(manifest['nodes']['model.a']['stats'])
+
+
+def test_load_metadata_keeps_only_requested_keys():
+    path = 'tests/dbt/test/target/manifest.json'
+    manifest = DbtArtifactProcessor.load_metadata(
+        path, [2], mock.Mock(), keys=['metadata', 'parent_map']
+    )
+
+    assert set(manifest.keys()) == {'metadata', 'parent_map'}
+
+
+def test_load_metadata_does_not_build_unwanted_keys():
+    ijson = pytest.importorskip('ijson')
+    path = 'tests/dbt/test/target/manifest.json'
+    with mock.patch.dict(os.environ, {"OPENLINEAGE_DBT_CACHE": "false"}), \
+            mock.patch.object(ijson, 'ObjectBuilder', wraps=ijson.ObjectBuilder) as builder:
+        manifest = DbtArtifactProcessor.load_metadata(
+            path, [2], mock.Mock(), keys=['metadata', 'parent_map']
+        )
+
+    # nodes, sources, macros etc. are containers too, but only the requested ones are built
+    assert builder.call_count == 2
+    assert set(manifest.keys()) == {'metadata', 'parent_map'}
+
+
+def test_load_metadata_is_cached():
+    path = 'tests/dbt/test/target/manifest.json'
+    first = DbtArtifactProcessor.load_metadata(path, [2], mock.Mock())
+
+    assert DbtArtifactProcessor.load_metadata(path, [2], mock.Mock()) is first
+
+    with mock.patch.dict(os.environ, {"OPENLINEAGE_DBT_CACHE": "false"}):
+        assert DbtArtifactProcessor.load_metadata(path, [2], mock.Mock()) is not first
+
+
+def test_load_metadata_cache_notices_rewrite_within_same_mtime(tmp_path):
+    path = tmp_path / 'run_results.json'
+    version = '{"metadata": {"dbt_schema_version": ' \
+        '"https://schemas.getdbt.com/dbt/run-results/v4.json"}'
+    path.write_text(version + ', "results": []}')
+    mtime = path.stat().st_mtime_ns
+    assert DbtArtifactProcessor.load_metadata(str(path), [4], mock.Mock())['results'] == []
+
+    path.write_text(version + ', "results": [{"unique_id": "model.a"}]}')
+    os.utime(path, ns=(mtime, mtime))
+    assert DbtArtifactProcessor.load_metadata(str(path), [4], mock.Mock())['results'] == [
+        {"unique_id": "model.a"}
+    ]
+
+
+def test_load_metadata_keeps_one_cached_copy_per_file():
+    path = 'tests/dbt/test/target/manifest.json'
+    DbtArtifactProcessor.load_metadata(path, [2], mock.Mock())
+    filtered = DbtArtifactProcessor.load_metadata(path, [2], mock.Mock(), keys=['metadata'])
+
+    assert DbtArtifactProcessor._cache[path][2] is filtered
+
+    DbtArtifactProcessor.clear_cache()
+    assert path not in DbtArtifactProcessor._cache
+
+
+def test_catalog_not_loaded_without_model_runs():
+    processor = DbtArtifactProcessor(
+        producer='https://github.com/OpenLineage/OpenLineage/tree/0.0.1/integration/dbt',
+        project_dir='tests/dbt/test',
+        job_namespace='job-namespace'
+    )
+
+    with mock.patch.object(processor, 'load_catalog') as load_catalog:
+        processor.parse()
+    load_catalog.assert_not_called()
+
+
 def test_seed_snapshot_nodes_do_not_throw():
     processor = DbtArtifactProcessor(
         producer='https://github.com/OpenLineage/OpenLineage/tree/0.0.1/integration/dbt',